@@ -2,28 +2,88 @@
 
 # Python 3.13 06/20/2025
 import argparse
-import glob
-import importlib
-import importlib.util
+import functools
+import hashlib
 import logging
 import os
 import sys
-from pathlib import Path
 
 from autobuild import common
 from autobuild.common import AutobuildError
 
 # Environment variable name used for default log level verbosity
 AUTOBUILD_LOGLEVEL = "AUTOBUILD_LOGLEVEL"
+# Environment variable fingerprinting the PATH autobuild last deduplicated
+AUTOBUILD_PATH_HASH = "AUTOBUILD_PATH_HASH"
+
+# AUTOBUILD_LOGLEVEL values and the log level each one selects
+_LEVEL_MAP = {
+    "": logging.WARNING,
+    "-q": logging.ERROR,
+    "--quiet": logging.ERROR,
+    "-v": logging.INFO,
+    "--verbose": logging.INFO,
+    "-d": logging.DEBUG,
+    "--debug": logging.DEBUG,
+}
+# the AUTOBUILD_LOGLEVEL value we pass down for each log level
+_LEVEL_OPTIONS = {
+    logging.ERROR: "--quiet",
+    logging.WARNING: "",
+    logging.INFO: "--verbose",
+    logging.DEBUG: "--debug",
+}
 
 _SCRIPT_DIR = os.path.abspath(os.path.dirname(__file__))
 
+# Kept as the raw string: argparse applies the -A option's type=int to a
+# string default when parsing, so a bad value is reported by main() rather
+# than breaking the import of this module.
+_AUTOBUILD_ADDRSIZE = os.environ.get("AUTOBUILD_ADDRSIZE", str(common.DEFAULT_ADDRSIZE))
+
+# Tool modules are named autobuild_tool_<name>.py
+_TOOL_PREFIX = "autobuild_tool_"
+# Tool modules that failed to import or don't define AutobuildTool
+_unknown_tools = set()
+
+
+@functools.lru_cache(maxsize=1)
+def _discover_tool_modules():
+    """
+    Return the names of all autobuild_tool_* modules, scanning _SCRIPT_DIR
+    only the first time we're asked. Nothing is imported here.
+    """
+    with os.scandir(_SCRIPT_DIR) as it:
+        return tuple(
+            e.name[:-3]
+            for e in it
+            if e.is_file(follow_symlinks=False)
+            and e.name.startswith(_TOOL_PREFIX)
+            and e.name.endswith(".py")
+        )
+
+
+@functools.lru_cache(maxsize=1)
+def _version_string():
+    """Only format the --version text when somebody asks for it"""
+    return "%%(prog)s %s" % common.AUTOBUILD_VERSION_STRING
+
+
+@functools.lru_cache(maxsize=1)
+def _tool_names():
+    """The set of valid tool names, for cheap membership tests"""
+    return frozenset(name[len(_TOOL_PREFIX) :] for name in _discover_tool_modules())
+
 
 class RunHelp(argparse.Action):
     def __call__(self, parser, namespace, values, option_string=None):
-        parser.parent.search_for_and_import_tools(parser.parent.tools_list)
-        parser.parent.register_tools(parser.parent.tools_list)
-        print(parser.format_help())
+        autobuild = parser.parent
+        # "--help <tool>": main() has already loaded just that tool
+        help_parser = autobuild.subparsers.choices.get(values)
+        if help_parser is None:
+            autobuild.register_tool_stubs()
+            help_parser = parser
+        print(help_parser.format_help())
         parser.exit(0)
 
 
@@ -53,23 +113,102 @@ class Version(argparse.Action):
 
     def __call__(self, parser, namespace, values, option_string=None):
         formatter = parser._get_formatter()
-        formatter.add_text(self.version or parser.version)
+        formatter.add_text(self.version or _version_string())
         print(formatter.format_help())
         parser.exit(message="")
 
 
 class Autobuild:
+    # Options accepted both before and after the tool name. The --quiet
+    # default comes from AUTOBUILD_LOGLEVEL and is filled in by __init__().
+    _STATIC_ARGDEFS = (
+        (
+            (
+                "-n",
+                "--dry-run",
+            ),
+            dict(help="run tool in dry run mode if available", action="store_true"),
+        ),
+        (
+            (
+                "-q",
+                "--quiet",
+            ),
+            dict(
+                help="minimal output",
+                action="store_const",
+                const=logging.ERROR,
+                dest="logging_level",
+            ),
+        ),
+        (
+            (
+                "-v",
+                "--verbose",
+            ),
+            dict(
+                help="verbose output",
+                action="store_const",
+                const=logging.INFO,
+                dest="logging_level",
+            ),
+        ),
+        (
+            (
+                "-d",
+                "--debug",
+            ),
+            dict(
+                help="debug output",
+                action="store_const",
+                const=logging.DEBUG,
+                dest="logging_level",
+            ),
+        ),
+        (
+            (
+                "-p",
+                "--platform",
+            ),
+            dict(
+                default=None,
+                dest="platform",
+                help=f'may only be the current platform or "{common.PLATFORM_COMMON}"',
+            ),
+        ),
+        (
+            (
+                "-A",
+                "--address-size",
+            ),
+            dict(
+                choices=[32, 64],
+                type=int,
+                default=_AUTOBUILD_ADDRSIZE,
+                dest="addrsize",
+                help="specify address size (modifies platform)",
+            ),
+        ),
+    )
+
     def __init__(self):
+        # The global options are registered once, here, and handed to the
+        # top-level parser and to every tool subparser through parents=
+        self.shared_parser = argparse.ArgumentParser(add_help=False)
+        default_loglevel = self.get_default_loglevel_from_environment()
+        for args, kwds in self._STATIC_ARGDEFS:
+            if "--quiet" in args:
+                kwds = dict(kwds, default=default_loglevel)
+            self.shared_parser.add_argument(*args, **kwds)
+
         self.parser = argparse.ArgumentParser(
-            description="Autobuild", prog="autobuild", add_help=False
+            description="Autobuild",
+            prog="autobuild",
+            add_help=False,
+            parents=[self.shared_parser],
         )
 
-        self.parser.add_argument(
-            "-V",
-            "--version",
-            action=Version,
-            version="%%(prog)s %s" % common.AUTOBUILD_VERSION_STRING,
-        )
+        self.parser.add_argument("-V", "--version", action=Version)
 
         self.subparsers = self.parser.add_subparsers(
             title="Sub Commands",
@@ -78,75 +217,62 @@ class Autobuild:
         )
 
     def listdir(self, dir):
-        files = os.listdir(dir)
-        if "AutobuildTool_test.py" in files:
-            files.remove("AutobuildTool_test.py")
-        return files
+        skip = "AutobuildTool_test.py"
+        with os.scandir(dir) as it:
+            return [e.name for e in it if e.name != skip]
 
     def register_tool(self, tool):
         newtool = tool.AutobuildTool()
         details = newtool.get_details()
         self.new_tool_subparser = self.subparsers.add_parser(
-            details["name"], help=details["description"]
+            details["name"],
+            help=details["description"],
+            parents=[self.shared_parser],
         )
         newtool.register(self.new_tool_subparser)
         return newtool
 
-    def register_tools(self, tools_list):
-        for tool in tools_list:
-            self.register_tool(tool)
-
-    def search_for_and_import_tools(self, tools_list):
-        for file_name in glob.glob(os.path.join(_SCRIPT_DIR, "autobuild_tool_*.py")):
-            module_name = Path(file_name).stem
-            possible_tool_module = importlib.import_module(
-                f".{module_name}", package="autobuild"
-            )
-            if hasattr(possible_tool_module, "AutobuildTool"):
-                tools_list.append(possible_tool_module)
+    def register_tool_stubs(self):
+        """
+        List every tool not yet registered in the usage and help output,
+        without importing any of them. Only needed when no tool was loaded.
+        """
+        for name in sorted(_tool_names()):
+            if name not in self.subparsers.choices:
+                self.subparsers.add_parser(name, help="(loads on use)")
 
     def try_to_import_tool(self, tool, tools_list):
-        try:
-            possible_tool_module = importlib.import_module(
-                f".autobuild_tool_{tool}", package="autobuild"
-            )
-            if hasattr(possible_tool_module, "AutobuildTool"):
-                tools_list.append(possible_tool_module)
-                instance = self.register_tool(possible_tool_module)
-                return instance
-        except ImportError:
-            pass
-        return -1
+        if tool not in _tool_names() or tool in _unknown_tools:
+            return -1
+        full = f"autobuild.{_TOOL_PREFIX}{tool}"
+        possible_tool_module = sys.modules.get(full)
+        if possible_tool_module is None:
+            import importlib
+
+            try:
+                possible_tool_module = importlib.import_module(full)
+            except ImportError:
+                _unknown_tools.add(tool)
+                return -1
+        if not hasattr(possible_tool_module, "AutobuildTool"):
+            _unknown_tools.add(tool)
+            return -1
+        tools_list.append(possible_tool_module)
+        return self.register_tool(possible_tool_module)
 
     def get_default_loglevel_from_environment(self):
+        environment_level = os.environ.get(AUTOBUILD_LOGLEVEL, "")
         try:
-            environment_level = os.environ[AUTOBUILD_LOGLEVEL]
+            return _LEVEL_MAP[environment_level]
         except KeyError:
-            environment_level = ""
-
-        if environment_level in ("--quiet", "-q"):
-            return logging.ERROR
-        elif environment_level == "":
-            return logging.WARNING
-        elif environment_level in ("--verbose", "-v"):
-            return logging.INFO
-        elif environment_level in ("--debug", "-d"):
-            return logging.DEBUG
-        else:
             raise AutobuildError(
                 f"invalid {AUTOBUILD_LOGLEVEL} value '{environment_level}'"
             )
 
     def set_recursive_loglevel(self, logger, level):
         logger.setLevel(level)
-        level_map = {
-            logging.ERROR: "--quiet",
-            logging.WARNING: "",
-            logging.INFO: "--verbose",
-            logging.DEBUG: "--debug",
-        }
-        if level in level_map:
-            os.environ[AUTOBUILD_LOGLEVEL] = level_map[level]
+        if level in _LEVEL_OPTIONS:
+            os.environ[AUTOBUILD_LOGLEVEL] = _LEVEL_OPTIONS[level]
         else:
             raise common.AutobuildError(
                 f"invalid effective log level {logging.getLevelName(level)}"
@@ -155,7 +281,6 @@ class Autobuild:
     def main(self, args_in):
         logger = logging.getLogger("autobuild")
         logger.addHandler(logging.StreamHandler())
-        default_loglevel = self.get_default_loglevel_from_environment()
 
         self.tools_list = []
 
@@ -169,91 +294,16 @@ class Autobuild:
             default=argparse.SUPPRESS,
         )
 
-        argdefs = (
-            (
-                (
-                    "-n",
-                    "--dry-run",
-                ),
-                dict(help="run tool in dry run mode if available", action="store_true"),
-            ),
-            (
-                (
-                    "-q",
-                    "--quiet",
-                ),
-                dict(
-                    help="minimal output",
-                    action="store_const",
-                    const=logging.ERROR,
-                    dest="logging_level",
-                    default=default_loglevel,
-                ),
-            ),
-            (
-                (
-                    "-v",
-                    "--verbose",
-                ),
-                dict(
-                    help="verbose output",
-                    action="store_const",
-                    const=logging.INFO,
-                    dest="logging_level",
-                ),
-            ),
-            (
-                (
-                    "-d",
-                    "--debug",
-                ),
-                dict(
-                    help="debug output",
-                    action="store_const",
-                    const=logging.DEBUG,
-                    dest="logging_level",
-                ),
-            ),
-            (
-                (
-                    "-p",
-                    "--platform",
-                ),
-                dict(
-                    default=None,
-                    dest="platform",
-                    help=f'may only be the current platform or "{common.PLATFORM_COMMON}"',
-                ),
-            ),
-            (
-                (
-                    "-A",
-                    "--address-size",
-                ),
-                dict(
-                    choices=[32, 64],
-                    type=int,
-                    default=int(
-                        os.environ.get("AUTOBUILD_ADDRSIZE", common.DEFAULT_ADDRSIZE)
-                    ),
-                    dest="addrsize",
-                    help="specify address size (modifies platform)",
-                ),
-            ),
-        )
-
-        for args, kwds in argdefs:
-            self.parser.add_argument(*args, **kwds)
-
         tool_to_run = -1
 
-        for arg in args_in:
-            if not arg.startswith("-"):
-                tool_to_run = self.try_to_import_tool(arg, self.tools_list)
-                if tool_to_run != -1:
-                    for args, kwds in argdefs:
-                        self.new_tool_subparser.add_argument(*args, **kwds)
-                break
+        # The first argument naming a known tool is the tool to run, even
+        # when it follows an option value (e.g. "-p linux build"). Load it
+        # before parsing so its own options and help are in place.
+        positional = next((arg for arg in args_in if arg in _tool_names()), None)
+        if positional:
+            tool_to_run = self.try_to_import_tool(positional, self.tools_list)
+        if tool_to_run == -1:
+            self.register_tool_stubs()
 
         args = self.parser.parse_args(args_in)
 
@@ -277,14 +327,32 @@ class Autobuild:
         return 0
 
 
+def _path_fingerprint(path, script_path):
+    return hashlib.blake2b(
+        os.pathsep.join((path, script_path)).encode(), digest_size=16
+    ).hexdigest()
+
+
+def _establish_path(script_path):
+    """
+    Append script_path to PATH and remove duplicate entries. The result is
+    fingerprinted in AUTOBUILD_PATH_HASH, so a nested autobuild run that
+    inherits the same PATH and script_path can skip dedup_path().
+    """
+    path = os.environ.get("PATH", "")
+    if os.environ.get(AUTOBUILD_PATH_HASH) == _path_fingerprint(path, script_path):
+        return
+    path = common.dedup_path(os.pathsep.join((path, script_path)))
+    os.environ["PATH"] = path
+    os.environ[AUTOBUILD_PATH_HASH] = _path_fingerprint(path, script_path)
+
+
 def main():
     script_path = os.path.dirname(common.get_autobuild_executable_path())
     logger = logging.getLogger("autobuild")
 
     try:
-        os.environ["PATH"] = common.dedup_path(
-            os.pathsep.join((os.environ.get("PATH", ""), script_path))
-        )
+        _establish_path(script_path)
         sys.exit(Autobuild().main(sys.argv[1:]))
     except KeyboardInterrupt as e:
         print(f"[DEBUG] User aborted with: {e}")
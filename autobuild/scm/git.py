@@ -1,6 +1,9 @@
 from __future__ import annotations
 import logging
+import os
 import subprocess
+import sys
+from functools import cached_property
 from pathlib import Path
 from typing import NamedTuple
 
@@ -53,29 +56,39 @@ class GitMeta(NamedTuple):
     version: Semver | str
 
 
-def _find_repo_dir(start: Path, level: int = 0) -> Path | None:
-    if level >= MAX_GIT_SEARCH_DEPTH:
-        return None
-    if (start / ".git").is_dir():
-        return start
+class GitInfo(NamedTuple):
+    revision: str
+    branch: str
+
+
+def _find_repo_dir(start: Path) -> Path | None:
+    # Walk plain strings rather than Path objects, only building a Path for
+    # the directory we end up returning
+    cur = os.fspath(start)
     if is_env_disabled("AUTOBUILD_SCM_SEARCH"):
-        return None
-    if start.parent == start:
-        return None
-    return _find_repo_dir(start.parent, level + 1)
+        return start if os.path.isdir(os.path.join(cur, ".git")) else None
+    for _ in range(MAX_GIT_SEARCH_DEPTH):
+        if os.path.isdir(os.path.join(cur, ".git")):
+            return Path(cur)
+        parent = os.path.dirname(cur)
+        if parent == cur:
+            return None
+        cur = parent
+    return None
 
 
 def _parse_describe(describe: str) -> GitMeta:
     log.debug(f"parsing git describe {describe}")
     dirty = describe.endswith("-dirty")
-    if dirty:
-        describe = describe[:-6]
-    raw_tag, distance, commit = describe.rsplit("-", 3 if dirty else 2)[-3:]
+    # Once "-dirty" is gone, exactly three fields remain: tag-distance-gcommit
+    raw_tag, distance, commit = (describe[:-6] if dirty else describe).rsplit("-", 2)
+    # Tags that aren't valid semver are used verbatim, minus any "v" prefix
+    tag = raw_tag.removeprefix("v")
     return GitMeta(
         dirty=dirty,
         distance=int(distance),
-        commit=commit[1:],
-        version=Semver.parse(raw_tag) or raw_tag.lstrip("v"),
+        commit=sys.intern(commit[1:]),
+        version=Semver.parse(raw_tag) or tag,
     )
 
 
@@ -89,34 +102,40 @@ class Git:
         log.debug(f"running git command: {' '.join(args)}")
         return cmd("git", "-C", str(self.repo_dir), *args)
 
+    @cached_property
+    def _collect_all(self) -> GitInfo:
+        """Fetch revision and branch together, once per client"""
+        # rev-parse answers both HEAD queries from a single process
+        revision, branch = self._git(
+            "rev-parse", "HEAD", "--abbrev-ref", "HEAD"
+        ).stdout.split("\n")
+        return GitInfo(revision=revision, branch=branch)
+
+    @cached_property
     def describe(self) -> str:
         p = self._git("describe", "--dirty", "--tags", "--long", "--match", "*[0-9]*")
         return p.stdout
 
-    @property
+    @cached_property
     def revision(self) -> str | None:
-        return self._git("rev-parse", "HEAD").stdout if self.repo_dir else None
+        return self._collect_all.revision if self.repo_dir else None
 
-    @property
+    @cached_property
     def url(self) -> str | None:
         return (
             self._git("remote", "get-url", "origin").stdout if self.repo_dir else None
         )
 
-    @property
+    @cached_property
     def branch(self) -> str | None:
-        return (
-            self._git("rev-parse", "--abbrev-ref", "HEAD").stdout
-            if self.repo_dir
-            else None
-        )
+        return self._collect_all.branch if self.repo_dir else None
 
-    @property
+    @cached_property
     def version(self) -> str | None:
         if not self.repo_dir:
             log.debug("no git root found, returning null version")
             return None
-        meta = _parse_describe(self.describe())
+        meta = _parse_describe(self.describe)
         next_version = (
             meta.version.next if isinstance(meta.version, Semver) else meta.version
         )
@@ -1,5 +1,10 @@
+import os
+import subprocess
 import sys
+from unittest.mock import patch
+
 import autobuild.autobuild_main
+from autobuild import common
 from tests.basetest import BaseTest
 
 captured_stdout = ""
@@ -60,14 +65,86 @@ class TestOptions(BaseTest):
             self.autobuild_fixture.main(["-v"])
         self.assertIn("autobuild", captured_stdout)
 
+    def test_version_string(self):
+        """-V should print the autobuild version and exit"""
+        with self.assertRaises(EarlyExitException):
+            self.autobuild_fixture.main(["-V"])
+        self.assertIn(f"autobuild {common.AUTOBUILD_VERSION_STRING}", captured_stdout)
+
     def test_tool_register(self):
         """check if autobuild_tool_test.py is registered"""
         with self.assertRaises(EarlyExitException):
             self.autobuild_fixture.main(["build", "-h"])
         self.assertIn("an option to pass to the build command", captured_stdout)
 
+    def test_tool_after_option_value(self):
+        """a tool named after an option's value is loaded from its stub"""
+        config = os.path.join(self.this_dir, "data", "autobuild-package-config.xml")
+        with patch("autobuild.configfile.pretty_print") as pretty_print:
+            self.autobuild_fixture.main(
+                [
+                    "-p",
+                    common.PLATFORM_COMMON,
+                    "print",
+                    "--json",
+                    "--config-file",
+                    config,
+                ]
+            )
+        self.assertEqual(pretty_print.call_args.kwargs["format"], "json")
+
+    def test_tool_help_after_option_value(self):
+        """help for a tool named after an option's value is the tool's own"""
+        with self.assertRaises(EarlyExitException):
+            self.autobuild_fixture.main(["-p", common.PLATFORM_COMMON, "build", "-h"])
+        self.assertIn("an option to pass to the build command", captured_stdout)
+
     def test_tool_search_for_tools(self):
-        """--help should show tool info"""
+        """--help should list every tool"""
         with self.assertRaises(EarlyExitException):
             self.autobuild_fixture.main(["--help"])
-        self.assertIn("Builds platform targets.", captured_stdout)
+        self.assertIn("source_environment", captured_stdout)
+
+    def test_tool_help(self):
+        """--help with a tool name should show that tool's help"""
+        with self.assertRaises(EarlyExitException):
+            self.autobuild_fixture.main(["--help", "build"])
+        self.assertIn("an option to pass to the build command", captured_stdout)
+
+
+class TestAddressSize(BaseTest):
+    def test_bad_addrsize_environment(self):
+        """a bad AUTOBUILD_ADDRSIZE fails in main(), not at import"""
+        env = dict(os.environ, AUTOBUILD_ADDRSIZE="abc")
+        p = subprocess.run(
+            [sys.executable, "-c", "import autobuild.autobuild_main"], env=env
+        )
+        self.assertEqual(p.returncode, 0)
+        p = subprocess.run(
+            [sys.executable, "-m", "autobuild.autobuild_main", "print"],
+            env=env,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        self.assertNotEqual(p.returncode, 0)
+        self.assertIn("invalid int value: 'abc'", p.stderr)
+
+    def test_addrsize_default(self):
+        args = autobuild.autobuild_main.Autobuild().parser.parse_args([])
+        self.assertIsInstance(args.addrsize, int)
+
+
+class TestEstablishPath(BaseTest):
+    def test_dedup_skipped_for_unchanged_path(self):
+        with patch.dict(os.environ, {"PATH": os.pathsep.join(("/a", "/b/", "/a"))}):
+            os.environ.pop(autobuild.autobuild_main.AUTOBUILD_PATH_HASH, None)
+            autobuild.autobuild_main._establish_path("/c")
+            self.assertEqual(os.environ["PATH"], os.pathsep.join(("/a", "/b", "/c")))
+            with patch("autobuild.common.dedup_path") as dedup_path:
+                autobuild.autobuild_main._establish_path("/c")
+                dedup_path.assert_not_called()
+            # a different script directory has to be added, so dedup again
+            autobuild.autobuild_main._establish_path("/d")
+            self.assertEqual(
+                os.environ["PATH"], os.pathsep.join(("/a", "/b", "/c", "/d"))
+            )
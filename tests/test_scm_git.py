@@ -1,12 +1,13 @@
 import os
+import subprocess
 from unittest import TestCase
 
 import pytest
 
 from autobuild.common import cmd
 from autobuild.scm.base import date
-from autobuild.scm.git import get_version
-from tests.basetest import chdir, git_repo, needs_git
+from autobuild.scm.git import Git, get_version
+from tests.basetest import chdir, envvar, git_repo, needs_git
 
 
 @needs_git
@@ -39,6 +40,31 @@ class GitTests(TestCase):
         version = get_version(self.repo)
         self.assertEqual(version, "1.0.0")
 
+    def test_vcs_info(self):
+        git = Git(self.repo)
+        self.assertEqual(git.revision, cmd("git", "rev-parse", "HEAD").stdout)
+        self.assertEqual(
+            git.branch, cmd("git", "rev-parse", "--abbrev-ref", "HEAD").stdout
+        )
+        self.assertEqual(git.url, "https://example.com/foo.git")
+
+    def test_vcs_info_no_origin(self):
+        # A missing remote only affects url, not revision or branch
+        cmd("git", "remote", "remove", "origin")
+        git = Git(self.repo)
+        self.assertEqual(git.revision, cmd("git", "rev-parse", "HEAD").stdout)
+        self.assertEqual(
+            git.branch, cmd("git", "rev-parse", "--abbrev-ref", "HEAD").stdout
+        )
+        with self.assertRaises(subprocess.CalledProcessError):
+            git.url
+
+    def test_version_cached(self):
+        git = Git(self.repo)
+        self.assertEqual(git.version, "1.0.0")
+        cmd("git", "tag", "v2.0.0")
+        self.assertEqual(git.version, "1.0.0")
+
     def test_no_distance_clean_from_stage(self):
         with chdir(os.path.join(self.repo, "stage")):
             version = get_version(self.repo)
@@ -50,6 +76,12 @@ class GitTests(TestCase):
         version = get_version(path)
         self.assertEqual(version, "1.0.0")
 
+    def test_no_search_child(self):
+        # With AUTOBUILD_SCM_SEARCH disabled only the given directory is checked
+        with envvar("AUTOBUILD_SCM_SEARCH", "false"):
+            self.assertIsNone(get_version(os.path.join(self.repo, "dir")))
+            self.assertEqual(get_version(self.repo), "1.0.0")
+
     def test_hotdog(self):
         version = get_version(self.repo)
         cmd("git", "tag", "hotdog")